@@ -30,3 +30,9 @@ def _in_memory_db() -> Iterator[None]:
 
     if Path(temp_path).exists():
         Path(temp_path).unlink()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_ast_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep CLI runs from reading or writing the developer's real AST cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", (tmp_path / "cache").as_posix())
@@ -0,0 +1,204 @@
+"""Persistent cache of parsed functions keyed by source digest.
+
+Usage:
+    uv run --env-file .env -m uniqfunc.ast_cache -h
+    uv run --env-file .env -m uniqfunc.ast_cache --database /tmp/uniqfunc.db
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from uniqfunc.model import FuncRef
+
+logger = logging.getLogger(__name__)
+
+MEMORY_DATABASE = ":memory:"
+PYTHON_VERSION = sys.version
+# Pinned rather than left to `pickle.DEFAULT_PROTOCOL` so the on-disk payload
+# format only changes when we change it. FuncRef lists hold no large buffers,
+# so protocol 5's out-of-band support buys nothing over 4 here; it is simply the
+# newest protocol every supported Python reads.
+PICKLE_PROTOCOL = 5
+# Bump whenever the table layout below changes; `_connect` drops and rebuilds
+# a table written under any other version instead of failing on old columns.
+SCHEMA_VERSION = 2
+
+# A cached row is only as good as the code that produced it. Keying on
+# `__version__` alone kept serving stale FuncRefs whenever the parser,
+# fingerprint, or model changed without a release, which is every dev run from
+# the source tree; worse, unpickling a slotted dataclass whose fields changed
+# assigns the stored state positionally onto the new fields. Hashing the
+# sources that decide a row's contents invalidates the cache on any such edit
+# for the price of reading four small files once per process.
+CODE_SOURCES = ("ast_cache.py", "fingerprint.py", "model.py", "parser.py")
+CODE_DIGEST = hashlib.sha256(
+    b"".join((Path(__file__).parent / name).read_bytes() for name in CODE_SOURCES)
+).hexdigest()
+
+# Another uniqfunc run (parallel pre-commit hooks, agent loops) may hold the
+# write lock. Its transactions are short, so a second is plenty to wait; past
+# that we skip the write rather than stall the scan for sqlite's default 5 s.
+BUSY_TIMEOUT_SECONDS = 1.0
+
+# Anything `pickle.loads` raises for a truncated, corrupted, or foreign payload.
+UNPICKLING_ERRORS = (
+    pickle.UnpicklingError,
+    AttributeError,
+    EOFError,
+    ImportError,
+    IndexError,
+    TypeError,
+    ValueError,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS functions (
+    path TEXT PRIMARY KEY,
+    digest BLOB NOT NULL,
+    python_version TEXT NOT NULL,
+    code_digest TEXT NOT NULL,
+    payload BLOB NOT NULL
+)
+"""
+
+
+type CacheEntry = tuple[Path, bytes, Sequence[FuncRef]]
+
+
+@dataclass(frozen=True, slots=True)
+class AstCache:
+    """Parsed functions per file, valid while source, Python, and parser code match.
+
+    Examples:
+        >>> cache = open_cache(MEMORY_DATABASE)
+        >>> cache.get(Path("/repo/a.py"), b"digest") is None
+        True
+        >>> cache.put(Path("/repo/a.py"), b"digest", [])
+        >>> cache.get(Path("/repo/a.py"), b"digest")
+        []
+        >>> cache.close()
+    """
+
+    connection: sqlite3.Connection
+
+    def get(self, path: Path, digest: bytes) -> list[FuncRef] | None:
+        try:
+            row = self.connection.execute(
+                "SELECT payload FROM functions "
+                "WHERE path = ? AND digest = ? AND python_version = ? AND code_digest = ?",
+                (path.as_posix(), digest, PYTHON_VERSION, CODE_DIGEST),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("AST cache read failed for %s (%s); parsing it", path, exc)
+            return None
+        if row is None:
+            return None
+        # A corrupt row must cost a re-parse, never the scan; see open_cache.
+        try:
+            return pickle.loads(row[0])
+        except UNPICKLING_ERRORS as exc:
+            logger.warning("Ignoring unreadable AST cache entry for %s (%s)", path, exc)
+            return None
+
+    def put(self, path: Path, digest: bytes, functions: Sequence[FuncRef]) -> None:
+        self.put_many([(path, digest, functions)])
+
+    def put_many(self, entries: Sequence[CacheEntry]) -> None:
+        rows = [
+            (
+                path.as_posix(),
+                digest,
+                PYTHON_VERSION,
+                CODE_DIGEST,
+                pickle.dumps(list(functions), protocol=PICKLE_PROTOCOL),
+            )
+            for path, digest, functions in entries
+        ]
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO functions VALUES (?, ?, ?, ?, ?)", rows
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Skipped writing %s AST cache entries (%s)", len(rows), exc)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "uniqfunc" / "cache.db"
+
+
+def _connect(database: str) -> sqlite3.Connection:
+    if database != MEMORY_DATABASE:
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(database, timeout=BUSY_TIMEOUT_SECONDS)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    (user_version,) = connection.execute("PRAGMA user_version").fetchone()
+    if user_version != SCHEMA_VERSION:
+        logger.debug(
+            "Rebuilding AST cache schema %s -> %s", user_version, SCHEMA_VERSION
+        )
+        connection.execute("DROP TABLE IF EXISTS functions")
+        connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    connection.execute(SCHEMA)
+    return connection
+
+
+# The cache only saves work, so an unwritable cache directory or a corrupted
+# database must never fail a scan; `get` and `put_many` likewise turn runtime
+# sqlite errors (a lock held by another run, a full disk, a database that
+# became read-only) into a miss or a skipped write. Falling back to an
+# in-memory database keeps a single code path for callers instead of threading
+# an optional cache around.
+def open_cache(database: str) -> AstCache:
+    assert database, "open_cache requires a database path or ':memory:'."
+    try:
+        connection = _connect(database)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("AST cache unavailable at %s (%s); using memory", database, exc)
+        connection = _connect(MEMORY_DATABASE)
+    logger.debug("Opened AST cache at %s", database)
+    return AstCache(connection=connection)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for module diagnostics."""
+    parser = argparse.ArgumentParser(description="Inspect the uniqfunc AST cache.")
+    parser.add_argument(
+        "--database",
+        default=default_cache_path().as_posix(),
+        help="SQLite cache database (defaults to the user cache directory).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str]) -> int:
+    """Run the module entry point.
+
+    Examples:
+        $ uv run --env-file .env -m uniqfunc.ast_cache
+    """
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    cache = open_cache(args.database)
+    (count,) = cache.connection.execute("SELECT COUNT(*) FROM functions").fetchone()
+    cache.close()
+    print(f"{args.database} files={count}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    raise SystemExit(main(sys.argv[1:]))
@@ -12,6 +12,8 @@ import sys
 from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
+from typing import TextIO
 
 from uniqfunc import __version__
 from uniqfunc.model import (
@@ -137,75 +139,117 @@ def format_text(scan_result: ScanResult) -> TextOutput:
     return TextOutput(stdout=stdout, stderr=stderr)
 
 
-def _func_ref_location(func_ref: FuncRef) -> dict[str, object]:
+# Reports can carry hundreds of thousands of conflicts and candidates, so the
+# payload is built from dict literals inside the comprehensions rather than one
+# helper call per element. Constant-key literals compile to a single
+# BUILD_CONST_KEY_MAP and skip a Python call per conflict and candidate.
+def _json_payload(scan_result: ScanResult) -> dict[str, object]:
     return {
-        "path": _path_to_string(func_ref.path),
-        "line": func_ref.line,
-        "col": func_ref.col,
-    }
-
-
-def _func_ref_identity(func_ref: FuncRef) -> dict[str, object]:
-    return {
-        "path": _path_to_string(func_ref.path),
-        "line": func_ref.line,
-        "col": func_ref.col,
-        "name": func_ref.name,
-    }
-
-
-def _naming_conflict_json(conflict: NamingConflict) -> dict[str, object]:
-    return {
-        "code": "UQF100",
-        "name": conflict.name,
-        "occurrence": _func_ref_location(conflict.occurrence),
-        "first_seen": _func_ref_location(conflict.first_seen),
-    }
-
-
-def _reuse_candidate_json(candidate: ReuseCandidate) -> dict[str, object]:
-    return {
-        "path": _path_to_string(candidate.path),
-        "line": candidate.line,
-        "col": candidate.col,
-        "name": candidate.name,
-        "score": candidate.score,
-        "signals": candidate.signals,
-    }
-
-
-def _reuse_suggestion_json(suggestion: ReuseSuggestion) -> dict[str, object]:
-    return {
-        "target": _func_ref_identity(suggestion.target),
-        "candidates": [
-            _reuse_candidate_json(candidate) for candidate in suggestion.candidates
-        ],
-    }
-
-
-def _scan_error_json(error: ScanError) -> dict[str, object]:
-    return {
-        "code": error.code,
-        "path": _path_to_string(error.path),
-        "line": error.line,
-        "col": error.col,
-        "message": error.message,
-    }
-
-
-def format_json(scan_result: ScanResult) -> str:
-    payload = {
         "version": __version__,
-        "repo_root": _path_to_string(scan_result.repo_root.resolve()),
+        "repo_root": scan_result.repo_root.resolve(),
         "naming_conflicts": [
-            _naming_conflict_json(conflict) for conflict in scan_result.conflicts
+            {
+                "code": "UQF100",
+                "name": conflict.name,
+                "occurrence": {
+                    "path": conflict.occurrence.path,
+                    "line": conflict.occurrence.line,
+                    "col": conflict.occurrence.col,
+                },
+                "first_seen": {
+                    "path": conflict.first_seen.path,
+                    "line": conflict.first_seen.line,
+                    "col": conflict.first_seen.col,
+                },
+            }
+            for conflict in scan_result.conflicts
         ],
         "reuse_suggestions": [
-            _reuse_suggestion_json(suggestion) for suggestion in scan_result.suggestions
+            {
+                "target": {
+                    "path": suggestion.target.path,
+                    "line": suggestion.target.line,
+                    "col": suggestion.target.col,
+                    "name": suggestion.target.name,
+                },
+                "candidates": [
+                    {
+                        "path": candidate.path,
+                        "line": candidate.line,
+                        "col": candidate.col,
+                        "name": candidate.name,
+                        "score": candidate.score,
+                        "signals": candidate.signals,
+                    }
+                    for candidate in suggestion.candidates
+                ],
+            }
+            for suggestion in scan_result.suggestions
+        ],
+        "errors": [
+            {
+                "code": error.code,
+                "path": error.path,
+                "line": error.line,
+                "col": error.col,
+                "message": error.message,
+            }
+            for error in scan_result.errors
         ],
-        "errors": [_scan_error_json(error) for error in scan_result.errors],
     }
-    return json.dumps(payload, indent=2)
+
+
+def _json_default(value: object) -> str:
+    assert isinstance(value, Path), (
+        f"unexpected {type(value).__name__} in JSON payload."
+    )
+    return value.as_posix()
+
+
+# orjson is an optional accelerator (`pip install uniqfunc[fast]`); the
+# runtime stays stdlib-only and falls back to `json` when it is missing. It is
+# imported on first use because an eager import cost every `--version` and
+# `--help` run about 2 ms for a module only JSON reports need.
+def _import_orjson() -> ModuleType | None:
+    try:
+        import orjson  # noqa: PLC0415
+    except ModuleNotFoundError:
+        return None
+    return orjson
+
+
+# orjson always emits UTF-8 bytes with raw non-ASCII, while `json.dump`
+# escapes it (`caf\u00e9`). Decoding orjson's bytes and writing them through
+# the text layer crashed with UnicodeEncodeError on non-UTF-8 consoles (Windows
+# cp1252, `PYTHONIOENCODING=ascii`) and held the report in memory twice. JSON
+# is UTF-8 by spec, so the bytes go straight to the stream's binary buffer;
+# streams without one (StringIO) take the ASCII-safe `json.dump` path.
+def write_json(scan_result: ScanResult, stream: TextIO) -> None:
+    """Write the JSON report to `stream` followed by a newline.
+
+    Paths stay `Path` objects in the payload and are rendered by the encoder's
+    `default` hook. With orjson installed and a binary buffer behind `stream`
+    the report is encoded in native code in one call; otherwise `json.dump`
+    streams the encoder's chunks so large reports never exist as one fully
+    formatted string in memory.
+
+    Examples:
+        >>> import io
+        >>> buffer = io.StringIO()
+        >>> write_json(ScanResult(repo_root=Path("/")), buffer)
+        >>> json.loads(buffer.getvalue())["repo_root"]
+        '/'
+    """
+    payload = _json_payload(scan_result)
+    binary = getattr(stream, "buffer", None)
+    orjson = _import_orjson()
+    if orjson is None or binary is None:
+        json.dump(payload, stream, indent=2, default=_json_default)
+        stream.write("\n")
+        return
+    options = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+    stream.flush()
+    binary.write(orjson.dumps(payload, default=_json_default, option=options))
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
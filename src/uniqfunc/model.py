@@ -7,6 +7,7 @@ Usage:
 import argparse
 import logging
 import pprint
+import re
 import sys
 from collections.abc import Sequence
 from dataclasses import dataclass, field
@@ -68,6 +69,17 @@ class NamingConflict:
         assert self.name, "NamingConflict.name must be a non-empty function name."
 
 
+@dataclass(frozen=True, slots=True)
+class NamePattern:
+    """Compiled `--exclude-name` regex, kept with its source text for reporting."""
+
+    raw: str
+    regex: re.Pattern[str]
+
+    def matches(self, name: str) -> bool:
+        return self.regex.search(name) is not None
+
+
 @dataclass(frozen=True, slots=True)
 class ReuseCandidate:
     """Candidate suggestion for potential reuse."""
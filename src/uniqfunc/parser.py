@@ -8,10 +8,11 @@ import argparse
 import ast
 import logging
 import pprint
+import re
 import sys
 from collections.abc import Sequence
-from dataclasses import dataclass
 from pathlib import Path
+from typing import NamedTuple
 
 from uniqfunc.fingerprint import fingerprint_function
 from uniqfunc.model import FuncRef, ScanError
@@ -19,15 +20,25 @@ from uniqfunc.model import FuncRef, ScanError
 logger = logging.getLogger(__name__)
 
 PARSE_ERROR_CODE = "UQF001"
-
-
-@dataclass(frozen=True, slots=True)
-class ParseOutcome:
+FUNCTION_NODE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+# `re.MULTILINE` only anchors `^` after `\n`, but Python also accepts a bare
+# `\r` as a line terminator (classic Mac files), so the pattern anchors on it
+# explicitly. The optional UTF-8 BOM matters for files saved by Windows
+# editors. Without either, such a file matched nothing and its functions
+# silently vanished from the scan even though `ast.parse` accepts it.
+FUNCTION_DEF_PATTERN = re.compile(
+    rb"(?:^|\r)(?:\xef\xbb\xbf)?[ \t\f]*(?:async\s+)?def\s", re.MULTILINE
+)
+STATEMENT_BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+
+# Built once per parsed file; see ReadOutcome in uniqfunc.scan for why these
+# per-file results are NamedTuples rather than frozen dataclasses.
+class ParseOutcome(NamedTuple):
     functions: list[FuncRef]
 
 
-@dataclass(frozen=True, slots=True)
-class ParseFailure:
+class ParseFailure(NamedTuple):
     error: ScanError
 
 
@@ -35,27 +46,72 @@ ParseResult = ParseOutcome | ParseFailure
 
 
 def _extract_params(args: ast.arguments) -> list[str]:
-    params: list[str] = []
-    params.extend(arg.arg for arg in args.posonlyargs)
-    params.extend(arg.arg for arg in args.args)
+    params = [arg.arg for arg in args.posonlyargs]
+    params += [arg.arg for arg in args.args]
     if args.vararg:
         params.append(f"*{args.vararg.arg}")
-    params.extend(arg.arg for arg in args.kwonlyargs)
+    params += [arg.arg for arg in args.kwonlyargs]
     if args.kwarg:
         params.append(f"**{args.kwarg.arg}")
     return params
 
 
+# `ast.unparse` builds a fresh `_Unparser` visitor per call, and it runs for
+# every annotation and default in every signature. The overwhelming majority of
+# those are bare names, dotted names, `None`, int or str literals (whose
+# `repr` is what `ast.unparse` emits), simple generics like
+# `list[str]`, and `X | None` unions, so those shapes are rendered directly and
+# everything else falls back to `ast.unparse`. Each fast path emits exactly
+# what `ast.unparse` would; operands are restricted to atoms so no precedence
+# parentheses are ever needed.
+def _format_expr(expr: ast.expr) -> str:
+    match expr:
+        case ast.Name(id=name):
+            return name
+        case ast.Constant(value=None | int() | str() as value, kind=None):
+            return repr(value)
+        case ast.Attribute(value=ast.Name() | ast.Attribute() as value, attr=attr):
+            return f"{_format_expr(value)}.{attr}"
+    return _format_compound(expr)
+
+
+def _format_compound(expr: ast.expr) -> str:
+    match expr:
+        case ast.Subscript(
+            value=ast.Name() | ast.Attribute() as value,
+            slice=ast.Tuple(elts=[_, _, *_] as elements),
+        ):
+            return f"{_format_expr(value)}[{', '.join(map(_format_expr, elements))}]"
+        case ast.Subscript(
+            value=ast.Name() | ast.Attribute() as value,
+            slice=index,
+        ) if not isinstance(index, ast.Tuple):
+            return f"{_format_expr(value)}[{_format_expr(index)}]"
+        case ast.BinOp(left=left, op=ast.BitOr(), right=right):
+            return _format_union(expr, left, right)
+    return ast.unparse(expr)
+
+
+def _format_union(union: ast.BinOp, left: ast.expr, right: ast.expr) -> str:
+    atoms = (ast.Name, ast.Attribute, ast.Subscript, ast.Constant)
+    left_ok = isinstance(left, atoms) or (
+        isinstance(left, ast.BinOp) and isinstance(left.op, ast.BitOr)
+    )
+    if left_ok and isinstance(right, atoms):
+        return f"{_format_expr(left)} | {_format_expr(right)}"
+    return ast.unparse(union)
+
+
 def _format_returns(returns: ast.expr | None) -> str | None:
     if returns is None:
         return None
-    return ast.unparse(returns)
+    return _format_expr(returns)
 
 
 def _format_arg(arg: ast.arg) -> str:
     if arg.annotation is None:
         return arg.arg
-    return f"{arg.arg}: {ast.unparse(arg.annotation)}"
+    return f"{arg.arg}: {_format_expr(arg.annotation)}"
 
 
 def _format_defaults(
@@ -68,7 +124,7 @@ def _format_defaults(
         value = _format_arg(arg)
         if index >= defaults_start:
             default_expr = defaults[index - defaults_start]
-            value = f"{value}={ast.unparse(default_expr)}"
+            value = f"{value}={_format_expr(default_expr)}"
         rendered.append(value)
     return rendered
 
@@ -104,7 +160,7 @@ def _format_kwonly_defaults(
     for kwarg, default in zip(kwonlyargs, defaults, strict=False):
         rendered = _format_arg(kwarg)
         if default is not None:
-            rendered = f"{rendered}={ast.unparse(default)}"
+            rendered = f"{rendered}={_format_expr(default)}"
         parts.append(rendered)
     return parts
 
@@ -115,14 +171,16 @@ def _format_kwarg(args: ast.arguments) -> list[str]:
     return []
 
 
-def _format_signature(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+def _format_signature(
+    node: ast.FunctionDef | ast.AsyncFunctionDef,
+    returns: str | None,
+) -> str:
     args = node.args
     parts = _format_positional_parts(args)
     parts.extend(_format_kwonly_parts(args))
     params = ", ".join(parts)
     prefix = "async " if isinstance(node, ast.AsyncFunctionDef) else ""
     signature = f"{prefix}def {node.name}({params})"
-    returns = _format_returns(node.returns)
     if returns:
         signature = f"{signature} -> {returns}"
     return f"{signature}:"
@@ -142,7 +200,7 @@ def _build_func_ref(
         line=line,
         col=col,
         name=node.name,
-        signature=_format_signature(node),
+        signature=_format_signature(node, returns),
         params=params,
         returns=returns,
         doc=doc,
@@ -150,22 +208,48 @@ def _build_func_ref(
     )
 
 
-class _FunctionCollector(ast.NodeVisitor):
-    def __init__(self, path: Path) -> None:
-        self._path = path
-        self.functions: list[FuncRef] = []
-
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        self.functions.append(_build_func_ref(node, self._path))
-        self.generic_visit(node)
-
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
-        self.functions.append(_build_func_ref(node, self._path))
-        self.generic_visit(node)
-
-
-def parse_function_defs(source: str, path: Path) -> ParseResult:
-    """Parse function defs from a Python source string.
+# A substring search runs at memory bandwidth while `ast.parse` manages a few
+# MB/s, and many tracked files (package `__init__.py`s, constants, protocol
+# stubs) define no functions at all. Python only allows `def` to start a
+# logical line, so when the anchored pattern finds nothing the file cannot
+# contribute a FuncRef and we skip the parser. The trade-off is that syntax
+# errors in such files go unreported, which is acceptable for a function-name
+# checker; any file that does define functions is still parsed in full.
+def _may_define_functions(source: str | bytes) -> bool:
+    data = source.encode("utf-8") if isinstance(source, str) else source
+    return b"def" in data and FUNCTION_DEF_PATTERN.search(data) is not None
+
+
+# A `def` is always a statement, so it can only sit in a statement block: a
+# module, class, or function body, or a compound statement's `orelse`,
+# `finalbody`, exception handlers, or match cases. `ast.walk` also descends
+# into every expression (annotations, call arguments, comprehensions), which
+# is most of the tree and can never hold a function. Walking only the
+# statement blocks visits a fraction of the nodes. Compiling with `optimize`
+# or `PyCF_OPTIMIZED_AST` would not help here: neither prunes the tree, and the
+# latter constant-folds expressions, which would change body fingerprints.
+def _function_nodes(tree: ast.Module) -> list[ast.FunctionDef | ast.AsyncFunctionDef]:
+    found: list[ast.FunctionDef | ast.AsyncFunctionDef] = []
+    stack: list[ast.AST] = list(tree.body)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, FUNCTION_NODE_TYPES):
+            found.append(node)
+        for field in STATEMENT_BLOCK_FIELDS:
+            block = getattr(node, field, None)
+            if type(block) is list:
+                stack.extend(block)
+    # The stack pops in reverse, so sorting by position restores the
+    # depth-first source order that diagnostics and tests rely on.
+    found.sort(key=lambda node: (node.lineno, node.col_offset))
+    return found
+
+
+def parse_function_defs(source: str | bytes, path: Path) -> ParseResult:
+    """Parse function defs from Python source text or raw file bytes.
+
+    Raw bytes go straight to the parser, which honours PEP 263 encoding
+    cookies and BOMs, so scanned files are never decoded twice.
 
     Examples:
         >>> outcome = parse_function_defs("def demo():\\n    return 1\\n", Path("a.py"))
@@ -175,6 +259,9 @@ def parse_function_defs(source: str, path: Path) -> ParseResult:
         'demo'
     """
     assert path, "parse_function_defs expects a path for diagnostics."
+    if not _may_define_functions(source):
+        logger.debug("Skipped parsing %s: no function definitions", path)
+        return ParseOutcome(functions=[])
     try:
         tree = ast.parse(source, filename=path.as_posix())
     except SyntaxError as exc:
@@ -190,10 +277,9 @@ def parse_function_defs(source: str, path: Path) -> ParseResult:
                 message=f"syntax error: {message}",
             ),
         )
-    collector = _FunctionCollector(path)
-    collector.visit(tree)
-    logger.debug("Parsed %s functions from %s", len(collector.functions), path)
-    return ParseOutcome(functions=collector.functions)
+    functions = [_build_func_ref(node, path) for node in _function_nodes(tree)]
+    logger.debug("Parsed %s functions from %s", len(functions), path)
+    return ParseOutcome(functions=functions)
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -212,8 +298,7 @@ def main(argv: Sequence[str]) -> int:
     parser = build_arg_parser()
     args = parser.parse_args(argv)
     path = Path(args.path)
-    source = path.read_text(encoding="utf-8")
-    result = parse_function_defs(source, path)
+    result = parse_function_defs(path.read_bytes(), path)
     if isinstance(result, ParseFailure):
         pprint.pprint(result.error)
         return 1
@@ -9,12 +9,20 @@ import logging
 import pprint
 import sys
 from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
 from pathlib import Path
 
 from uniqfunc.model import FuncRef, ReuseCandidate, ReuseSuggestion
 from uniqfunc.parser import ParseFailure, parse_function_defs
-from uniqfunc.similarity_ast import ast_similarity
-from uniqfunc.similarity_name_signature import name_signature_score
+from uniqfunc.similarity_ast import AstFeatures, ast_features, ast_features_similarity
+from uniqfunc.similarity_name_signature import (
+    NameSignatureFeatures,
+    NameSignatureScore,
+    name_edit_similarity,
+    name_edit_upper_bound,
+    name_signature_features,
+    name_signature_features_score,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,40 +38,81 @@ def _sorted_functions(functions: Iterable[FuncRef]) -> list[FuncRef]:
     )
 
 
-def _score_candidate(target: FuncRef, candidate: FuncRef) -> ReuseCandidate:
-    name_score = name_signature_score(target, candidate)
-    ast_score = ast_similarity(target.ast_fingerprint, candidate.ast_fingerprint)
-    final_score = (NAME_SIGNATURE_WEIGHT * name_score.final_score) + (
-        AST_WEIGHT * ast_score
+@dataclass(frozen=True, slots=True)
+class _ScoringFeatures:
+    func: FuncRef
+    name_signature: NameSignatureFeatures
+    ast: AstFeatures
+
+
+def _scoring_features(func: FuncRef) -> _ScoringFeatures:
+    return _ScoringFeatures(
+        func=func,
+        name_signature=name_signature_features(func),
+        ast=ast_features(func.ast_fingerprint),
+    )
+
+
+def _combined_score(name_score: NameSignatureScore, ast_score: float) -> float:
+    return (NAME_SIGNATURE_WEIGHT * name_score.final_score) + (AST_WEIGHT * ast_score)
+
+
+# Every target is compared with every other function, so anything derived from
+# a single function (name tokens, normalized params, shingle sets, token
+# counts) comes precomputed in `_ScoringFeatures`. The name edit ratio is a
+# SequenceMatcher run per pair and costs more than the other signals combined.
+# The combined score only grows with it, so the pair is first scored with the
+# ratio's upper bound. The exact ratio is computed only when that bound
+# reaches the threshold. Skipped pairs would have been filtered out anyway.
+def _score_candidate(
+    target: _ScoringFeatures,
+    candidate: _ScoringFeatures,
+    threshold: float,
+) -> ReuseCandidate | None:
+    ast_score = ast_features_similarity(target.ast, candidate.ast)
+    bound = name_signature_features_score(
+        target.name_signature,
+        candidate.name_signature,
+        name_edit_upper_bound(target.func.name, candidate.func.name),
     )
-    signals = {
-        "name_token_jaccard": name_score.name_token_jaccard,
-        "signature_score": name_score.signature_score,
-        "ast_score": ast_score,
-    }
+    if _combined_score(bound, ast_score) < threshold:
+        return None
+    name_score = name_signature_features_score(
+        target.name_signature,
+        candidate.name_signature,
+        name_edit_similarity(target.func.name, candidate.func.name),
+    )
+    final_score = _combined_score(name_score, ast_score)
+    if final_score < threshold:
+        return None
+    func = candidate.func
     return ReuseCandidate(
-        path=candidate.path,
-        line=candidate.line,
-        col=candidate.col,
-        name=candidate.name,
-        signature=candidate.signature,
+        path=func.path,
+        line=func.line,
+        col=func.col,
+        name=func.name,
+        signature=func.signature,
         score=final_score,
-        signals=signals,
+        signals={
+            "name_token_jaccard": name_score.name_token_jaccard,
+            "signature_score": name_score.signature_score,
+            "ast_score": ast_score,
+        },
     )
 
 
 def _filter_and_rank_candidates(
-    target: FuncRef,
-    functions: Sequence[FuncRef],
+    target: _ScoringFeatures,
+    features: Sequence[_ScoringFeatures],
     threshold: float,
     top_k: int,
 ) -> list[ReuseCandidate]:
     scored: list[ReuseCandidate] = []
-    for candidate in functions:
+    for candidate in features:
         if candidate is target:
             continue
-        scored_candidate = _score_candidate(target, candidate)
-        if scored_candidate.score < threshold:
+        scored_candidate = _score_candidate(target, candidate, threshold)
+        if scored_candidate is None:
             continue
         scored.append(scored_candidate)
     scored.sort(
@@ -93,13 +142,13 @@ def reuse_suggestions(
     """
     assert 0.0 <= threshold <= 1.0, "threshold must be between 0 and 1."
     assert top_k > 0, "top_k must be a positive integer."
-    ordered = _sorted_functions(functions)
+    features = [_scoring_features(func) for func in _sorted_functions(functions)]
     suggestions: list[ReuseSuggestion] = []
-    for target in ordered:
-        candidates = _filter_and_rank_candidates(target, ordered, threshold, top_k)
+    for target in features:
+        candidates = _filter_and_rank_candidates(target, features, threshold, top_k)
         if not candidates:
             continue
-        suggestions.append(ReuseSuggestion(target=target, candidates=candidates))
+        suggestions.append(ReuseSuggestion(target=target.func, candidates=candidates))
     logger.debug("Generated %s reuse suggestions", len(suggestions))
     return suggestions
 
@@ -118,8 +167,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
 
 
 def _load_functions(path: Path) -> list[FuncRef]:
-    source = path.read_text(encoding="utf-8")
-    result = parse_function_defs(source, path)
+    result = parse_function_defs(path.read_bytes(), path)
     if isinstance(result, ParseFailure):
         logger.error("Failed to parse %s: %s", path, result.error.message)
         return []
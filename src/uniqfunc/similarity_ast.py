@@ -9,16 +9,15 @@ import logging
 import pprint
 import sys
 from collections import Counter
-from collections.abc import Iterable, Sequence
+from collections.abc import Sequence
+from dataclasses import dataclass
 
-from uniqfunc.fingerprint import shingle_tokens
+from uniqfunc.fingerprint import Shingle, shingle_tokens
 
 logger = logging.getLogger(__name__)
 
 
-def _jaccard(left: Iterable[object], right: Iterable[object]) -> float:
-    left_set = set(left)
-    right_set = set(right)
+def _jaccard(left_set: frozenset[Shingle], right_set: frozenset[Shingle]) -> float:
     if not left_set and not right_set:
         return 1.0
     union = left_set | right_set
@@ -27,9 +26,7 @@ def _jaccard(left: Iterable[object], right: Iterable[object]) -> float:
     return len(left_set & right_set) / len(union)
 
 
-def multiset_jaccard(left: Sequence[str], right: Sequence[str]) -> float:
-    left_counts = Counter(left)
-    right_counts = Counter(right)
+def _counter_jaccard(left_counts: Counter[str], right_counts: Counter[str]) -> float:
     if not left_counts and not right_counts:
         return 1.0
     intersection = left_counts & right_counts
@@ -41,6 +38,36 @@ def multiset_jaccard(left: Sequence[str], right: Sequence[str]) -> float:
     return intersection_size / union_size
 
 
+def multiset_jaccard(left: Sequence[str], right: Sequence[str]) -> float:
+    return _counter_jaccard(Counter(left), Counter(right))
+
+
+@dataclass(frozen=True, slots=True)
+class AstFeatures:
+    """Shingles and token counts for one fingerprint, built once per scan.
+
+    `shingles` is None when the fingerprint is shorter than one shingle, which
+    sends every comparison involving it to the multiset fallback.
+    """
+
+    counts: Counter[str]
+    shingles: frozenset[Shingle] | None
+
+
+def ast_features(tokens: Sequence[str], shingle_size: int = 5) -> AstFeatures:
+    assert shingle_size > 0, "shingle_size must be positive."
+    shingles = None
+    if len(tokens) >= shingle_size:
+        shingles = frozenset(shingle_tokens(tokens, size=shingle_size))
+    return AstFeatures(counts=Counter(tokens), shingles=shingles)
+
+
+def ast_features_similarity(left: AstFeatures, right: AstFeatures) -> float:
+    if left.shingles is None or right.shingles is None:
+        return _counter_jaccard(left.counts, right.counts)
+    return _jaccard(left.shingles, right.shingles)
+
+
 def ast_similarity(
     left_tokens: Sequence[str],
     right_tokens: Sequence[str],
@@ -54,12 +81,10 @@ def ast_similarity(
         >>> round(ast_similarity(["A", "B"], ["A", "C"], shingle_size=5), 2)
         0.33
     """
-    assert shingle_size > 0, "shingle_size must be positive."
-    if len(left_tokens) < shingle_size or len(right_tokens) < shingle_size:
-        return multiset_jaccard(left_tokens, right_tokens)
-    shingles_left = shingle_tokens(left_tokens, size=shingle_size)
-    shingles_right = shingle_tokens(right_tokens, size=shingle_size)
-    return _jaccard(shingles_left, shingles_right)
+    return ast_features_similarity(
+        ast_features(left_tokens, shingle_size),
+        ast_features(right_tokens, shingle_size),
+    )
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -9,6 +9,7 @@ import logging
 import pprint
 import sys
 from collections.abc import Sequence
+from collections.abc import Set as AbstractSet
 from dataclasses import dataclass
 from difflib import SequenceMatcher
 from pathlib import Path
@@ -26,19 +27,31 @@ class NameSignatureScore:
     final_score: float
 
 
+@dataclass(frozen=True, slots=True)
+class NameSignatureFeatures:
+    """Normalized name and signature parts of one function, built once per scan."""
+
+    name_tokens: frozenset[str]
+    param_names: frozenset[str]
+    param_count: int
+    returns: str | None
+
+
 def snake_tokens(name: str) -> set[str]:
     return {token for token in name.lower().split("_") if token}
 
 
-def name_token_jaccard(name_a: str, name_b: str) -> float:
-    tokens_a = snake_tokens(name_a)
-    tokens_b = snake_tokens(name_b)
-    if not tokens_a and not tokens_b:
+def _set_jaccard(left: AbstractSet[str], right: AbstractSet[str]) -> float:
+    if not left and not right:
         return 1.0
-    union = tokens_a | tokens_b
+    union = left | right
     if not union:
         return 0.0
-    return len(tokens_a & tokens_b) / len(union)
+    return len(left & right) / len(union)
+
+
+def name_token_jaccard(name_a: str, name_b: str) -> float:
+    return _set_jaccard(snake_tokens(name_a), snake_tokens(name_b))
 
 
 def name_edit_similarity(name_a: str, name_b: str) -> float:
@@ -47,6 +60,15 @@ def name_edit_similarity(name_a: str, name_b: str) -> float:
     return SequenceMatcher(None, name_a, name_b).ratio()
 
 
+# SequenceMatcher.ratio() is 2 * matches / total length, and matches can never
+# exceed the shorter name. This is the same bound as `real_quick_ratio()`,
+# computed without building a matcher.
+def name_edit_upper_bound(name_a: str, name_b: str) -> float:
+    if not name_a and not name_b:
+        return 1.0
+    return 2.0 * min(len(name_a), len(name_b)) / (len(name_a) + len(name_b))
+
+
 def _normalize_param(param: str) -> str:
     return param.lstrip("*").lower()
 
@@ -54,12 +76,7 @@ def _normalize_param(param: str) -> str:
 def param_name_jaccard(params_a: Sequence[str], params_b: Sequence[str]) -> float:
     names_a = {_normalize_param(name) for name in params_a}
     names_b = {_normalize_param(name) for name in params_b}
-    if not names_a and not names_b:
-        return 1.0
-    union = names_a | names_b
-    if not union:
-        return 0.0
-    return len(names_a & names_b) / len(union)
+    return _set_jaccard(names_a, names_b)
 
 
 def param_count_similarity(count_a: int, count_b: int) -> float:
@@ -80,13 +97,47 @@ def return_annotation_match(ret_a: str | None, ret_b: str | None) -> float:
     return 1.0 if ret_a == ret_b else 0.0
 
 
-def signature_similarity(left: FuncRef, right: FuncRef) -> float:
-    count_score = param_count_similarity(len(left.params), len(right.params))
-    name_score = param_name_jaccard(left.params, right.params)
+def name_signature_features(func: FuncRef) -> NameSignatureFeatures:
+    return NameSignatureFeatures(
+        name_tokens=frozenset(snake_tokens(func.name)),
+        param_names=frozenset(_normalize_param(name) for name in func.params),
+        param_count=len(func.params),
+        returns=func.returns,
+    )
+
+
+def signature_features_similarity(
+    left: NameSignatureFeatures, right: NameSignatureFeatures
+) -> float:
+    count_score = param_count_similarity(left.param_count, right.param_count)
+    name_score = _set_jaccard(left.param_names, right.param_names)
     return_score = return_annotation_match(left.returns, right.returns)
     return (count_score + name_score + return_score) / 3.0
 
 
+def signature_similarity(left: FuncRef, right: FuncRef) -> float:
+    return signature_features_similarity(
+        name_signature_features(left), name_signature_features(right)
+    )
+
+
+def name_signature_features_score(
+    left: NameSignatureFeatures,
+    right: NameSignatureFeatures,
+    edit_score: float,
+) -> NameSignatureScore:
+    token_score = _set_jaccard(left.name_tokens, right.name_tokens)
+    signature_score = signature_features_similarity(left, right)
+    name_score = (token_score + edit_score) / 2.0
+    final_score = (name_score + signature_score) / 2.0
+    return NameSignatureScore(
+        name_token_jaccard=token_score,
+        name_edit_similarity=edit_score,
+        signature_score=signature_score,
+        final_score=final_score,
+    )
+
+
 def name_signature_score(left: FuncRef, right: FuncRef) -> NameSignatureScore:
     """Compute the combined name + signature similarity.
 
@@ -97,16 +148,10 @@ def name_signature_score(left: FuncRef, right: FuncRef) -> NameSignatureScore:
         >>> round(score.name_token_jaccard, 2)
         0.75
     """
-    token_score = name_token_jaccard(left.name, right.name)
-    edit_score = name_edit_similarity(left.name, right.name)
-    name_score = (token_score + edit_score) / 2.0
-    signature_score = signature_similarity(left, right)
-    final_score = (name_score + signature_score) / 2.0
-    return NameSignatureScore(
-        name_token_jaccard=token_score,
-        name_edit_similarity=edit_score,
-        signature_score=signature_score,
-        final_score=final_score,
+    return name_signature_features_score(
+        name_signature_features(left),
+        name_signature_features(right),
+        name_edit_similarity(left.name, right.name),
     )
 
 
@@ -0,0 +1,145 @@
+import hashlib
+import sqlite3
+import subprocess
+from collections.abc import Sequence
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+import uniqfunc.ast_cache
+import uniqfunc.scan
+from uniqfunc.ast_cache import default_cache_path, open_cache
+from uniqfunc.cli import main
+from uniqfunc.model import FuncRef
+
+EXIT_CONFLICT = 1
+
+
+def _run_git(repo_path: Path, args: Sequence[str]) -> None:
+    completed = subprocess.run(
+        ["git", *args],
+        cwd=repo_path,
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    assert completed.returncode == 0, (
+        f"git {' '.join(args)} failed: {completed.stdout}\n{completed.stderr}"
+    )
+
+
+def _init_repo(repo_path: Path) -> None:
+    repo_path.mkdir()
+    _run_git(repo_path, ["init"])
+    _run_git(repo_path, ["config", "user.email", "tests@example.com"])
+    _run_git(repo_path, ["config", "user.name", "Tests"])
+
+
+def test_cache_round_trips_functions_by_digest(tmp_path: Path) -> None:
+    cache = open_cache((tmp_path / "cache.db").as_posix())
+    path = tmp_path / "a.py"
+    func = FuncRef(
+        Path("a.py"), 1, 1, "demo", "def demo():", [], None, None, ["RETURN"]
+    )
+    cache.put(path, b"first", [func])
+    assert cache.get(path, b"first") == [func]
+    assert cache.get(path, b"second") is None
+    cache.put(path, b"second", [])
+    assert cache.get(path, b"first") is None
+    assert cache.get(path, b"second") == []
+    cache.close()
+
+
+def test_cache_falls_back_to_memory_when_unusable(tmp_path: Path) -> None:
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("", encoding="utf-8")
+    cache = open_cache((blocker / "cache.db").as_posix())
+    cache.put(tmp_path / "a.py", b"digest", [])
+    assert cache.get(tmp_path / "a.py", b"digest") == []
+    cache.close()
+
+
+def test_warm_run_skips_parsing_unchanged_files(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    (repo_path / "a.py").write_text("def dup():\n    return 1\n", encoding="utf-8")
+    (repo_path / "b.py").write_text("def dup():\n    return 2\n", encoding="utf-8")
+
+    assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    cold_output = capsys.readouterr().out
+    assert default_cache_path().is_file()
+
+    def _fail_parse(*_args: object, **_kwargs: object) -> None:
+        message = "cached files must not be parsed again"
+        raise AssertionError(message)
+
+    monkeypatch.setattr(uniqfunc.scan, "parse_function_defs", _fail_parse)
+    assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    assert capsys.readouterr().out == cold_output
+
+
+def test_cache_misses_rows_from_other_parser_code(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = open_cache((tmp_path / "cache.db").as_posix())
+    path = tmp_path / "a.py"
+    cache.put(path, b"digest", [])
+    monkeypatch.setattr(uniqfunc.ast_cache, "CODE_DIGEST", "edited-parser")
+    assert cache.get(path, b"digest") is None
+    cache.close()
+
+
+def test_cache_treats_corrupt_payload_as_miss(tmp_path: Path) -> None:
+    cache = open_cache((tmp_path / "cache.db").as_posix())
+    path = tmp_path / "a.py"
+    cache.put(path, b"digest", [])
+    with cache.connection:
+        cache.connection.execute("UPDATE functions SET payload = ?", (b"\x80garbage",))
+    assert cache.get(path, b"digest") is None
+    cache.close()
+
+
+def test_cache_rebuilds_tables_from_older_schema(tmp_path: Path) -> None:
+    database = tmp_path / "cache.db"
+    with closing(sqlite3.connect(database)) as connection:
+        connection.execute("CREATE TABLE functions (path TEXT PRIMARY KEY)")
+        connection.commit()
+    cache = open_cache(database.as_posix())
+    cache.put(tmp_path / "a.py", b"digest", [])
+    assert cache.get(tmp_path / "a.py", b"digest") == []
+    cache.close()
+
+
+def test_scan_survives_locked_cache(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    (repo_path / "a.py").write_text("def dup():\n    return 1\n", encoding="utf-8")
+    (repo_path / "b.py").write_text("def dup():\n    return 2\n", encoding="utf-8")
+    assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    capsys.readouterr()
+
+    changed_source = b"def dup():\n    return 3\n"
+    (repo_path / "b.py").write_bytes(changed_source)
+    assert main(["--no-cache", "--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    uncached_output = capsys.readouterr().out
+
+    monkeypatch.setattr(uniqfunc.ast_cache, "BUSY_TIMEOUT_SECONDS", 0.01)
+    with closing(sqlite3.connect(default_cache_path())) as holder:
+        holder.execute("BEGIN EXCLUSIVE")
+        assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    assert capsys.readouterr().out == uncached_output
+    cache = open_cache(default_cache_path().as_posix())
+    changed_digest = hashlib.sha256(changed_source).digest()
+    assert cache.get(repo_path.resolve() / "b.py", changed_digest) is None
+    assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    assert cache.get(repo_path.resolve() / "b.py", changed_digest) is not None
+    cache.close()
@@ -1,5 +1,7 @@
+import io
 import json
 import subprocess
+import sys
 from collections.abc import Sequence
 from pathlib import Path
 
@@ -91,3 +93,40 @@ def test_json_output_schema(tmp_path: Path, capsys: pytest.CaptureFixture[str])
     candidate = clamp_suggestion["candidates"][0]
     assert {"path", "line", "col", "name", "score", "signals"} <= candidate.keys()
     assert payload["errors"] == []
+
+
+def test_json_output_matches_without_orjson(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    (repo_path / "a.py").write_text("def dup():\n    return 1\n", encoding="utf-8")
+    (repo_path / "b.py").write_text("def dup():\n    return 2\n", encoding="utf-8")
+
+    assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    default_payload = json.loads(capsys.readouterr().out)
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    output = capsys.readouterr().out
+    assert output.endswith("}\n")
+    assert json.loads(output) == default_payload
+
+
+def test_json_output_survives_non_utf8_stdout(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    source = "def café():\n    return 1\n"
+    (repo_path / "a.py").write_text(source, encoding="utf-8")
+    (repo_path / "b.py").write_text(source, encoding="utf-8")
+
+    raw = io.BytesIO()
+    stdout = io.TextIOWrapper(raw, encoding="ascii")
+    monkeypatch.setattr(sys, "stdout", stdout)
+    assert main(["--format", "json", str(repo_path)]) == EXIT_CONFLICT
+    stdout.flush()
+    payload = json.loads(raw.getvalue().decode("utf-8"))
+    assert payload["naming_conflicts"][0]["name"] == "café"
@@ -97,3 +97,27 @@ def test_cli_reports_git_missing(
     output = capsys.readouterr().out
     errors = _parse_errors(output)
     assert any(error["code"] == "UQF003" for error in errors)
+
+
+def test_cli_reports_deleted_tracked_file(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    deleted = repo_path / "deleted.py"
+    deleted.write_text("def demo():\n    return 1\n", encoding="utf-8")
+    _run_git(repo_path, ["add", "deleted.py"])
+    _run_git(repo_path, ["commit", "-m", "Add file"])
+    deleted.unlink()
+    exit_code = main(["--format", "json", str(repo_path)])
+    assert exit_code == EXIT_OK
+    errors = _parse_errors(capsys.readouterr().out)
+    assert errors == [
+        {
+            "code": "UQF000",
+            "path": "deleted.py",
+            "line": 1,
+            "col": 1,
+            "message": "file path does not exist or is not a file.",
+        },
+    ]
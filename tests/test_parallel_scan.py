@@ -0,0 +1,81 @@
+import json
+import subprocess
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+
+from uniqfunc.cli import main
+from uniqfunc.scan import PARALLEL_MIN_FILES
+
+EXIT_CONFLICT = 1
+
+
+def _run_git(repo_path: Path, args: Sequence[str]) -> None:
+    completed = subprocess.run(
+        ["git", *args],
+        cwd=repo_path,
+        capture_output=True,
+        check=False,
+        text=True,
+    )
+    assert completed.returncode == 0, (
+        f"git {' '.join(args)} failed: {completed.stdout}\n{completed.stderr}"
+    )
+
+
+def _init_repo(repo_path: Path) -> None:
+    repo_path.mkdir()
+    _run_git(repo_path, ["init"])
+    _run_git(repo_path, ["config", "user.email", "tests@example.com"])
+    _run_git(repo_path, ["config", "user.name", "Tests"])
+
+
+def _write_modules(repo_path: Path, file_count: int) -> None:
+    for index in range(file_count):
+        (repo_path / f"mod_{index:02d}.py").write_text(
+            f"def shared():\n    return {index}\n\ndef unique_{index:02d}():\n    pass\n",
+            encoding="utf-8",
+        )
+    (repo_path / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+
+
+def _assert_scan_in_file_order(output: str, file_count: int) -> None:
+    payload = json.loads(output)
+    conflicts = payload["naming_conflicts"]
+    assert len(conflicts) == file_count - 1
+    assert all(conflict["first_seen"]["path"] == "mod_00.py" for conflict in conflicts)
+    assert [conflict["occurrence"]["path"] for conflict in conflicts] == [
+        f"mod_{index:02d}.py" for index in range(1, file_count)
+    ]
+    assert [error["path"] for error in payload["errors"]] == ["broken.py"]
+
+
+def test_parallel_scan_matches_file_order(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    file_count = PARALLEL_MIN_FILES + 4
+    _write_modules(repo_path, file_count)
+
+    exit_code = main(["--format", "json", str(repo_path)])
+    assert exit_code == EXIT_CONFLICT
+    _assert_scan_in_file_order(capsys.readouterr().out, file_count)
+
+
+def test_free_threaded_scan_matches_file_order(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    repo_path = tmp_path / "repo"
+    _init_repo(repo_path)
+    file_count = PARALLEL_MIN_FILES + 4
+    _write_modules(repo_path, file_count)
+
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    exit_code = main(["--format", "json", str(repo_path)])
+    assert exit_code == EXIT_CONFLICT
+    _assert_scan_in_file_order(capsys.readouterr().out, file_count)
@@ -63,3 +63,89 @@ def test_parse_function_defs_reports_syntax_errors() -> None:
     assert result.error.path == Path("bad.py")
     assert result.error.line == 1
     assert result.error.col >= 1
+
+
+def test_parse_function_defs_honours_encoding_cookie() -> None:
+    source = "# -*- coding: latin-1 -*-\ndef caf\xe9() -> str:\n    return 'ol\xe9'\n"
+    result = parse_function_defs(source.encode("latin-1"), Path("legacy.py"))
+    assert isinstance(result, ParseOutcome)
+    assert [func.name for func in result.functions] == ["caf\xe9"]
+
+
+def test_parse_function_defs_reports_undecodable_bytes() -> None:
+    result = parse_function_defs(b"def demo():\n    return '\xff'\n", Path("bad.py"))
+    assert isinstance(result, ParseFailure)
+    assert result.error.code == "UQF001"
+
+
+def test_parse_function_defs_skips_sources_without_defs() -> None:
+    source = b"default_value = 1\n__all__ = ['undefined']\nbroken = (\n"
+    result = parse_function_defs(source, Path("__init__.py"))
+    assert isinstance(result, ParseOutcome)
+    assert result.functions == []
+
+
+def test_parse_function_defs_detects_indented_async_defs() -> None:
+    source = b"class Demo:\n    async  def fetch(self):\n        return 1\n"
+    result = parse_function_defs(source, Path("demo.py"))
+    assert isinstance(result, ParseOutcome)
+    assert [func.name for func in result.functions] == ["fetch"]
+
+
+def test_parse_function_defs_renders_common_annotations() -> None:
+    source = (
+        "def render(a: dict[str, int] | None = None, *, b: typing.Any = 'x',"
+        " c: tuple[int, ...] = (1,)) -> pkg.mod.Type[int]:\n"
+        "    return a\n"
+    )
+    result = parse_function_defs(source, Path("render.py"))
+    assert isinstance(result, ParseOutcome)
+    func = result.functions[0]
+    assert func.returns == "pkg.mod.Type[int]"
+    assert func.signature == (
+        "def render(a: dict[str, int] | None=None, *, b: typing.Any='x', "
+        "c: tuple[int, ...]=(1,)) -> pkg.mod.Type[int]:"
+    )
+
+
+def test_parse_function_defs_finds_defs_in_every_statement_block() -> None:
+    source = (
+        "try:\n"
+        "    def in_try(): pass\n"
+        "except ValueError:\n"
+        "    def in_handler(): pass\n"
+        "else:\n"
+        "    def in_else(): pass\n"
+        "finally:\n"
+        "    def in_finally(): pass\n"
+        "match command:\n"
+        "    case 'go':\n"
+        "        def in_case(): pass\n"
+        "while ready:\n"
+        "    with lock:\n"
+        "        def in_with(): pass\n"
+    )
+    result = parse_function_defs(source, Path("blocks.py"))
+    assert isinstance(result, ParseOutcome)
+    assert [func.name for func in result.functions] == [
+        "in_try",
+        "in_handler",
+        "in_else",
+        "in_finally",
+        "in_case",
+        "in_with",
+    ]
+
+
+def test_parse_function_defs_finds_def_after_utf8_bom() -> None:
+    source = b"\xef\xbb\xbfdef first():\n    return 1\n"
+    result = parse_function_defs(source, Path("bom.py"))
+    assert isinstance(result, ParseOutcome)
+    assert [func.name for func in result.functions] == ["first"]
+
+
+def test_parse_function_defs_finds_def_after_bare_carriage_return() -> None:
+    source = b"x = 1\rdef f():\r    pass\r"
+    result = parse_function_defs(source, Path("cr.py"))
+    assert isinstance(result, ParseOutcome)
+    assert [func.name for func in result.functions] == ["f"]
@@ -1,8 +1,19 @@
 from pathlib import Path
 
+import pytest
+
 from uniqfunc.model import FuncRef, ReuseSuggestion
 from uniqfunc.parser import ParseOutcome, parse_function_defs
 from uniqfunc.similarity import reuse_suggestions
+from uniqfunc.similarity_ast import (
+    ast_features,
+    ast_features_similarity,
+    ast_similarity,
+)
+from uniqfunc.similarity_name_signature import (
+    name_edit_similarity,
+    name_edit_upper_bound,
+)
 
 SIMILARITY_THRESHOLD = 0.7
 TOP_K = 2
@@ -93,3 +104,38 @@ def test_similarity_limits_top_k_and_sorts() -> None:
         for candidate in alpha_suggestion.candidates
     ]
     assert keys == sorted(keys)
+
+
+def test_name_edit_upper_bound_never_undercuts_ratio() -> None:
+    names = ["clamp", "clamp_value", "parse", "parse_args", "x", "_private"]
+    for left in names:
+        for right in names:
+            bound = name_edit_upper_bound(left, right)
+            assert bound >= name_edit_similarity(left, right)
+
+
+SHORT_STREAM = ["RETURN", "VAR"]
+CLAMP_STREAM = ["IF", "VAR", "<", "VAR", "RETURN", "VAR"]
+CLAMP_TAIL_STREAM = [*CLAMP_STREAM, "RETURN"]
+
+
+# Expected scores are worked out by hand from the shingle and multiset Jaccard
+# definitions, so they pin the scores independently of the implementation.
+@pytest.mark.parametrize(
+    ("left", "right", "expected"),
+    [
+        ([], [], 1.0),
+        ([], SHORT_STREAM, 0.0),
+        # Shorter than one shingle: multiset {RETURN, VAR} vs {IF, VAR x3, <, RETURN}.
+        (SHORT_STREAM, CLAMP_STREAM, 2 / 6),
+        (CLAMP_STREAM, CLAMP_STREAM, 1.0),
+        # Two shared 5-shingles out of three distinct ones.
+        (CLAMP_STREAM, CLAMP_TAIL_STREAM, 2 / 3),
+    ],
+)
+def test_ast_features_similarity_scores(
+    left: list[str], right: list[str], expected: float
+) -> None:
+    features_score = ast_features_similarity(ast_features(left), ast_features(right))
+    assert features_score == pytest.approx(expected)
+    assert ast_similarity(left, right) == pytest.approx(expected)